@@ -1,14 +1,19 @@
 import streamlit as st
-import requests
 import random
+from itertools import islice
 from datetime import date
 
+from presets import (preset_itineraries, PRESET_GLOBAL_TASKS, SEASONS, WEATHER_ADVICE,
+                     LANGUAGE_TIPS, GENERIC_WEATHER, GENERIC_LANGUAGE)
+
 # ---------------- Dynamic Fallback Generation ---------------- #
 
+@st.cache_data(max_entries=128)
 def generate_dynamic_fallback(destination, count):
     """
     Generates 'count' unique fallback tasks for the given destination 
-    using a variety of templates and adjectives.
+    using a variety of templates and adjectives. The choice is seeded by the
+    destination so the cached result is stable across reruns.
     """
     templates = [
         "Explore local art galleries in {}",
@@ -35,16 +40,14 @@ def generate_dynamic_fallback(destination, count):
     adjectives = ["amazing", "unforgettable", "charming", "historic", 
                   "vibrant", "quaint", "dynamic", "bustling", "splendid", 
                   "exciting", "remarkable"]
-    fallbacks = set()
-    attempts = 0
-    while len(fallbacks) < count and attempts < count * 10:
-        tpl = random.choice(templates)
-        prefix = (random.choice(adjectives) + " ") if random.random() < 0.6 else ""
-        fallback_item = tpl.format(prefix + destination)
-        fallbacks.add(fallback_item)
-        attempts += 1
-    return list(fallbacks)
+    # Every (template, adjective) pair yields a distinct task, so sampling the
+    # combinations directly guarantees uniqueness without a rejection loop.
+    combos = [(tpl, adj) for tpl in templates for adj in adjectives + [None]]
+    rng = random.Random(destination)
+    picks = rng.sample(combos, min(count, len(combos)))
+    return [tpl.format(f"{adj} {destination}" if adj else destination) for tpl, adj in picks]
 
+@st.cache_data(max_entries=128)
 def get_fallback_list(destination):
     """
     Returns a fallback pool with 50 unique fallback tasks for the destination.
@@ -53,26 +56,18 @@ def get_fallback_list(destination):
 
 # ------------------ Helper Functions ------------------ #
 
-def split_list(lst, n):
-    """Splits list 'lst' into n nearly equal parts."""
-    if n <= 0:
-        return []
-    k, m = divmod(len(lst), n)
-    return [lst[i * k + min(i, m):(i + 1) * k + min(i + 1, m)] for i in range(n)]
-
 def create_global_pool(tasks, fallback_list, destination, required):
     """
     Builds a global pool by removing duplicates from tasks and adding fallback items 
     until we have at least 'required' unique items.
     """
-    unique_tasks = []
-    for task in tasks:
-        if task not in unique_tasks:
-            unique_tasks.append(task)
-    while len(unique_tasks) < required:
-        candidate = fallback_list[random.randrange(len(fallback_list))]
-        if candidate not in unique_tasks:
-            unique_tasks.append(candidate)
+    unique_tasks = list(dict.fromkeys(tasks))
+    need = required - len(unique_tasks)
+    if need <= 0:
+        return unique_tasks
+    seen = set(unique_tasks)
+    candidates = [f for f in fallback_list if f not in seen]
+    unique_tasks.extend(random.sample(candidates, need))
     return unique_tasks
 
 def generate_groups_from_global_pool(global_pool, days, tasks_per_day):
@@ -81,36 +76,52 @@ def generate_groups_from_global_pool(global_pool, days, tasks_per_day):
     and splits them into groups of tasks_per_day.
     """
     required = days * tasks_per_day
-    sampled_tasks = random.sample(global_pool, required)
-    groups = [sampled_tasks[i * tasks_per_day:(i + 1) * tasks_per_day] for i in range(days)]
+    it = iter(random.sample(global_pool, required))
+    groups = [list(islice(it, tasks_per_day)) for _ in range(days)]
     return groups
 
-def fetch_itinerary_from_wiki(destination, duration):
+WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
+WIKI_TIMEOUT = (2, 5)  # (connect, read) seconds
+
+@st.cache_resource(show_spinner=False)
+def _wiki_session():
     """
-    Uses Wikipedia's opensearch API to fetch tourist attraction suggestions 
-    for a custom destination. After deduplication and augmentation with fallback items,
-    it ensures there are at least (duration * 3) unique items and splits them into daily groups.
+    Returns the HTTP session used for Wikipedia calls, shared across reruns so
+    connections are pooled. 'requests' is imported here so preset destinations
+    never pay for loading it.
+    """
+    import requests
+    session = requests.Session()
+    session.headers.update({"User-Agent": "travel-planner/1.0"})
+    return session
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _wiki_opensearch(destination, limit):
+    """
+    Queries Wikipedia's opensearch API and returns the list of suggestions.
+    Responses are cached for an hour so reruns do not repeat the request.
     """
-    points_required = duration * 3  
-    base_url = "https://en.wikipedia.org/w/api.php"
     params = {
         "action": "opensearch",
         "search": f"{destination} tourist attractions",
-        "limit": points_required,
+        "limit": limit,
         "namespace": 0,
         "format": "json"
     }
+    response = _wiki_session().get(WIKI_API_URL, params=params, timeout=WIKI_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+    return data[1]  # suggestion list
+
+def fetch_itinerary_from_wiki(destination, duration):
+    """
+    Uses Wikipedia's opensearch API to fetch tourist attraction suggestions 
+    for a custom destination. After deduplication and augmentation with fallback items,
+    it ensures there are at least (duration * 3) unique items and splits them into daily groups.
+    """
+    points_required = duration * 3  
     try:
-        response = requests.get(base_url, params=params, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        tasks = data[1]  # suggestion list
-        
-        unique_tasks = []
-        for t in tasks:
-            if t not in unique_tasks:
-                unique_tasks.append(t)
-        tasks = unique_tasks
+        tasks = _wiki_opensearch(destination, points_required)
         
         fallback_list = get_fallback_list(destination)
         global_pool = create_global_pool(tasks, fallback_list, destination, points_required)
@@ -126,52 +137,11 @@ def get_travel_advice(destination, travel_date):
     Returns weather advice (based on the month) and language tips for the destination.
     Provides specific advice for preset destinations and generic messages for others.
     """
-    month = travel_date.month
     month_name = travel_date.strftime("%B")
-    if destination == "Paris":
-        if month in [12, 1, 2]:
-            weather = f"In {month_name}, Paris is wintry (around 5-10°C) – pack heavy, warm clothing."
-        elif month in [3, 4, 5]:
-            weather = f"In {month_name}, Paris enjoys mild spring weather (10-15°C) with occasional rain – bring a light jacket and umbrella."
-        elif month in [6, 7, 8]:
-            weather = f"In {month_name}, Paris is pleasantly warm (20-25°C) though evenings can be cool – opt for light clothing and a sweater."
-        else:
-            weather = f"In {month_name}, Paris is cool and sometimes rainy (10-15°C) – layering is advisable."
-        language = "French is the official language. Basic phrases like 'Bonjour', 'Merci', and 'Au revoir' are very useful."
-    elif destination == "Tokyo":
-        if month in [12, 1, 2]:
-            weather = f"During {month_name}, Tokyo can be chilly (5-10°C) – pack warm layers."
-        elif month in [3, 4, 5]:
-            weather = f"In {month_name}, Tokyo enjoys mild weather (10-18°C) with some rain – dress in layers and carry an umbrella."
-        elif month in [6, 7, 8]:
-            weather = f"In {month_name}, Tokyo is hot and humid (25-30°C) – wear light, breathable clothing and use sunscreen."
-        else:
-            weather = f"In {month_name}, Tokyo's weather is mild with occasional showers (15-20°C) – a light jacket is sufficient."
-        language = "Japanese is the primary language. Learning phrases like 'こんにちは (Konnichiwa)' and 'ありがとう (Arigatou)' can enhance your trip."
-    elif destination == "New York":
-        if month in [12, 1, 2]:
-            weather = f"New York in {month_name} is cold (−2°C to 5°C) – heavy winter attire is a must."
-        elif month in [3, 4, 5]:
-            weather = f"In {month_name}, New York is mild (10-18°C) but can be unpredictable – dress in layers and bring a raincoat."
-        elif month in [6, 7, 8]:
-            weather = f"{month_name} in New York is hot and humid (25-30°C) – wear light clothing and stay hydrated."
-        else:
-            weather = f"During {month_name}, New York has moderate temperatures (10-20°C) – layered clothing is recommended."
-        language = "English is the primary language."
-    elif destination == "Goa":
-        if month in [12, 1, 2]:
-            weather = f"In {month_name}, Goa is cooler (20-25°C) and ideal for sightseeing – pack a light jacket for evenings."
-        elif month in [3, 4, 5]:
-            weather = f"{month_name} in Goa is warm (25-30°C) and dry – opt for very light, breathable clothing."
-        elif month in [6, 7, 8]:
-            weather = f"During {month_name}, Goa is hot and humid (28-33°C) with occasional rain – choose ultra-light clothes, use sunscreen, and stay hydrated."
-        else:
-            weather = f"In {month_name}, Goa is pleasantly warm (25-30°C) with a chance of brief showers – pack accordingly."
-        language = "English is widely spoken along with Konkani. Basic English usually suffices."
-    else:
-        weather = f"Weather in {destination} during {month_name} can be variable – please check the forecast and pack accordingly."
-        language = f"Local languages in {destination} may vary – consider learning a few basic phrases or using a translation app."
-    return weather, language
+    weather = WEATHER_ADVICE.get((destination, SEASONS[travel_date.month]), GENERIC_WEATHER)
+    language = LANGUAGE_TIPS.get(destination, GENERIC_LANGUAGE)
+    return (weather.format(month=month_name, destination=destination),
+            language.format(destination=destination))
 
 def get_budget_tip(budget):
     """
@@ -184,61 +154,17 @@ def get_budget_tip(budget):
     else:
         return "Enjoy premium experiences, fine dining, and exclusive guided tours."
 
-# ------------------ Preset Itinerary Data ------------------ #
-
-preset_itineraries = {
-    "Paris": [
-        "Morning: Visit the Eiffel Tower and enjoy panoramic views.",
-        "Late Morning: Explore the Louvre Museum to see timeless artworks.",
-        "Afternoon: Savor lunch at a charming café along the Seine.",
-        "Early Afternoon: Visit the exterior of Notre-Dame Cathedral and wander historic streets.",
-        "Late Afternoon: Stroll through Montmartre and admire Sacré-Cœur Basilica.",
-        "Evening: Dine in a traditional French bistro and sample local specialties.",
-        "Night: Enjoy a scenic river cruise on the Seine with illuminated landmarks."
-    ],
-    "Tokyo": [
-        "Morning: Begin at Senso-ji Temple in Asakusa and explore bustling market streets.",
-        "Late Morning: Wander along Nakamise Street while sampling traditional snacks.",
-        "Afternoon: Enjoy a sushi lunch at a renowned local eatery.",
-        "Early Afternoon: Stroll through Ueno Park and visit eclectic museums.",
-        "Late Afternoon: Experience the energy of Shibuya Crossing.",
-        "Evening: Dine in Shinjuku and take in the lively nightlife.",
-        "Night: Relax at an izakaya or enjoy city views from an observatory."
-    ],
-    "New York": [
-        "Morning: Start with breakfast in Times Square to feel the city’s energy.",
-        "Late Morning: Walk through Central Park, visiting iconic spots like Bethesda Terrace.",
-        "Afternoon: Have lunch at a famous deli and visit a world-class museum.",
-        "Early Afternoon: Explore trendy neighborhoods like SoHo for art and shopping.",
-        "Late Afternoon: Take a ferry ride to see the Statue of Liberty up close.",
-        "Evening: Enjoy a Broadway show followed by dinner at a top-tier restaurant.",
-        "Night: Experience the vibrant nightlife or take a relaxing stroll through a buzzing district."
-    ],
-    "Goa": [
-        "Morning: Relax on Baga Beach and watch a serene sunrise over the Arabian Sea.",
-        "Late Morning: Explore Fort Aguada for its historic charm and coastal views.",
-        "Afternoon: Savor a seafood lunch at a beachside shack.",
-        "Early Afternoon: Tour a spice plantation to learn about local flavors.",
-        "Late Afternoon: Enjoy water sports or take a boat ride along the coast.",
-        "Evening: Stroll along the beach while sampling local street food.",
-        "Night: Dine on authentic Goan cuisine and enjoy live music by the sea."
-    ]
-}
-
 # ------------------ Streamlit App Layout ------------------ #
 
-st.set_page_config(
-    page_title="Travel Itinerary Planner",
-    page_icon="🌍",
-    layout="wide"
-)
+PAGE_CONFIG = {
+    "page_title": "Travel Itinerary Planner",
+    "page_icon": "🌍",
+    "layout": "wide"
+}
 
-# Import Montserrat font from Google Fonts
-st.markdown("""
+# Montserrat font from Google Fonts plus the app stylesheet, emitted in one call
+PAGE_STYLE = """
 <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;700&display=swap" rel="stylesheet">
-""", unsafe_allow_html=True)
-
-css = """
 <style>
 body {
     background-color: #ADD8E6; /* Light blue background */
@@ -298,7 +224,16 @@ div[data-testid="stAppViewContainer"] {
 }
 </style>
 """
-st.markdown(css, unsafe_allow_html=True)
+
+def _init_ui():
+    """
+    Applies the page config and stylesheet. Both are static constants, but
+    Streamlit expects them on every run, so this is not cached.
+    """
+    st.set_page_config(**PAGE_CONFIG)
+    st.markdown(PAGE_STYLE, unsafe_allow_html=True)
+
+_init_ui()
 
 # ------------------ Sidebar: User Inputs ------------------ #
 
@@ -346,65 +281,7 @@ st.markdown("</div>", unsafe_allow_html=True)
 if st.button("Generate Itinerary"):
     
     if destination in preset_itineraries:
-        base_points = preset_itineraries[destination]
-        if destination == "Goa":
-            extra_tasks = [
-                "Explore local art galleries in Goa",
-                "Attend a cultural performance in Goa",
-                "Relax in one of Goa's scenic parks",
-                "Visit an offbeat museum in Goa",
-                "Experience the vibrant nightlife of Goa",
-                "Take a local cooking class in Goa",
-                "Shop at Mapusa Market in Goa",
-                "Shop at Anjuna Flea Market in Goa",
-                "Join a guided historical tour in Goa"
-            ]
-        elif destination == "Paris":
-            extra_tasks = [
-                "Explore chic boutiques and art galleries in Paris",
-                "Attend a classical music concert in Paris",
-                "Relax at a riverside park in Paris",
-                "Visit a contemporary art museum in Paris",
-                "Experience Parisian nightlife in trendy bars",
-                "Take a pastry-making class in Paris",
-                "Shop at local flea markets in Paris",
-                "Join a guided walking tour in Montmartre"
-            ]
-        elif destination == "Tokyo":
-            extra_tasks = [
-                "Explore futuristic art galleries in Tokyo",
-                "Attend a traditional Kabuki performance in Tokyo",
-                "Relax in a serene Japanese garden in Tokyo",
-                "Visit a modern museum in Tokyo",
-                "Experience Tokyo's bustling nightlife in Shibuya",
-                "Take a sushi-making class in Tokyo",
-                "Shop at local district markets in Tokyo",
-                "Join a guided tour of historical temples in Tokyo"
-            ]
-        elif destination == "New York":
-            extra_tasks = [
-                "Explore local art galleries in New York",
-                "Attend a Broadway musical in New York",
-                "Relax in Central Park",
-                "Visit a cutting-edge museum in New York",
-                "Experience New York's vibrant nightlife",
-                "Take a culinary tour of New York's diverse neighborhoods",
-                "Shop at trendy boutiques and street fairs in New York",
-                "Join a guided historical tour of Manhattan"
-            ]
-        else:
-            extra_tasks = [
-                f"Explore local art galleries in {destination}",
-                f"Attend a cultural performance in {destination}",
-                f"Relax in a scenic park in {destination}",
-                f"Visit a modern museum in {destination}",
-                f"Experience vibrant nightlife in {destination}",
-                f"Take a local cooking class in {destination}",
-                f"Shop at local markets in {destination}",
-                f"Join a guided historical tour in {destination}"
-            ]
-            
-        global_tasks = list(set(base_points + extra_tasks))
+        global_tasks = PRESET_GLOBAL_TASKS[destination]
         fallback_list = get_fallback_list(destination)
         global_pool = create_global_pool(global_tasks, fallback_list, destination, duration * 3)
         groups = generate_groups_from_global_pool(global_pool, duration, 3)
@@ -418,9 +295,9 @@ if st.button("Generate Itinerary"):
             groups = generate_groups_from_global_pool(global_pool, duration, 3)
             itinerary = [{"Day": i + 1, "Activities": group} for i, group in enumerate(groups)]
     
-    if start_location.strip() and start_location.lower() != destination.lower():
+    if itinerary and start_location.strip() and start_location.lower() != destination.lower():
         departure_message = f"Take a flight from {start_location} to {destination}."
-        itinerary[0]['Activities'] = [departure_message] + itinerary[0]['Activities']
+        itinerary[0]['Activities'].insert(0, departure_message)
         return_message = f"Take a flight from {destination} back to {start_location}."
         itinerary[-1]['Activities'].append(return_message)
     
@@ -430,11 +307,9 @@ if st.button("Generate Itinerary"):
     
     st.subheader("Your Travel Itinerary")
     for day in itinerary:
-        st.markdown("<div class='itinerary-container'>", unsafe_allow_html=True)
-        st.markdown(f"<div class='day-header'>Day {day['Day']}</div>", unsafe_allow_html=True)
-        for activity in day["Activities"]:
-            st.markdown(f"<div class='activities'>• {activity}</div>", unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
+        activities_html = "".join(f"<div class='activities'>• {activity}</div>" for activity in day["Activities"])
+        day_html = f"<div class='itinerary-container'><div class='day-header'>Day {day['Day']}</div>{activities_html}</div>"
+        st.markdown(day_html, unsafe_allow_html=True)
     
     weather_info, language_info = get_travel_advice(destination, travel_date)
     st.subheader("Additional Travel Information")